@@ -3,10 +3,26 @@ Debug utilities for development and testing.
 """
 import os
 import logging
-from typing import List, Dict, Any
+from operator import itemgetter
+from types import CodeType
+from typing import List, Dict, Any, Tuple
+from importlib.machinery import ModuleSpec
 import importlib.util
 import questionary
 
+# devops/debug.py -> project root -> src/examples
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_EXAMPLES_DIR = os.path.join(_PROJECT_ROOT, 'src', 'examples')
+
+# Separator line printed under headings
+_SEP = "=" * 80
+
+# Tree connectors indexed by "is last item"
+_CONNECTORS = ("├── ", "└── ")
+
+# Indentation strings indexed by nesting level
+_INDENTS = tuple("  " * level for level in range(32))
+
 
 class DebugTools:
     """
@@ -24,6 +40,12 @@ class DebugTools:
             handler.setFormatter(logging.Formatter('%(message)s'))
             self.logger.addHandler(handler)
 
+        # Example file tree, built on first use and reused between redraws
+        self._tree_cache = None
+
+        # Compiled example code keyed by path: (mtime_ns, code)
+        self._code_cache: Dict[str, Tuple[int, CodeType]] = {}
+
     def get_example_files(self) -> Dict[str, Any]:
         """
         Get tree structure of example files.
@@ -31,20 +53,17 @@ class DebugTools:
         Returns:
             Dictionary representing the file tree
         """
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        examples_dir = os.path.join(project_root, 'src', 'examples')
-
         def build_tree(path: str) -> Dict[str, Any]:
             tree = {}
-            for item in os.listdir(path):
-                full_path = os.path.join(path, item)
-                if os.path.isdir(full_path):
-                    tree[item] = build_tree(full_path)
-                elif item.endswith('.py'):
-                    tree[item] = full_path
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        tree[entry.name] = build_tree(entry.path)
+                    elif entry.name.endswith('.py'):
+                        tree[entry.name] = entry.path
             return tree
 
-        return build_tree(examples_dir)
+        return build_tree(_EXAMPLES_DIR)
 
     def create_choices(self, tree: Dict[str, Any], prefix: str = "", level: int = 0) -> List[questionary.Choice]:
         """
@@ -58,42 +77,77 @@ class DebugTools:
         Returns:
             List of questionary choices
         """
-        choices = []
-        indent = "  " * level
-        is_last = True
+        entries: List[Tuple[str, str, str]] = []
+        self._walk(tree, prefix, level, entries)
+        return [
+            questionary.Choice(title=title, value=value, description=description)
+            for title, value, description in entries
+        ]
+
+    def _walk(self, tree: Dict[str, Any], prefix: str, level: int, out: List[Tuple[str, str, str]]) -> None:
+        """
+        Append entries for a tree level (and its subdirectories) to out.
+
+        Args:
+            tree: File tree dictionary
+            prefix: Path prefix for nested items
+            level: Current nesting level
+            out: Accumulator for (title, value, description) tuples
+        """
+        indent = _INDENTS[level] if level < len(_INDENTS) else "  " * level
 
-        # Sort items to show directories first, then files
-        items = sorted(tree.items(), key=lambda x: (not isinstance(x[1], dict), x[0]))
+        # Show directories first, then files, each sorted by name
+        dirs, files = [], []
+        for item in tree.items():
+            (dirs if isinstance(item[1], dict) else files).append(item)
+        dirs.sort(key=itemgetter(0))
+        files.sort(key=itemgetter(0))
+        items = dirs + files
+        last = len(items) - 1
 
         for i, (name, value) in enumerate(items):
-            is_last = i == len(items) - 1
-            connector = "└── " if is_last else "├── "
+            connector = _CONNECTORS[i == last]
 
             if isinstance(value, dict):
                 # Directory
-                choices.append(questionary.Choice(
-                    title=f"{indent}{connector}📁 {name}/",
-                    value=f"dir:{prefix}{name}",
-                    description=f"Browse directory: {name}"
+                out.append((
+                    f"{indent}{connector}📁 {name}/",
+                    f"dir:{prefix}{name}",
+                    f"Browse directory: {name}"
                 ))
-                choices.extend(self.create_choices(value, f"{prefix}{name}/", level + 1))
+                self._walk(value, f"{prefix}{name}/", level + 1, out)
             else:
                 # File
-                choices.append(questionary.Choice(
-                    title=f"{indent}{connector}📄 {name}",
-                    value=f"file:{value}",
-                    description=f"Run example: {name}"
+                out.append((
+                    f"{indent}{connector}📄 {name}",
+                    f"file:{value}",
+                    f"Run example: {name}"
                 ))
 
         # Add back option for nested directories
         if prefix:
-            choices.append(questionary.Choice(
-                title=f"{indent}└── 🔙 ..",
-                value="back",
-                description="Go back"
-            ))
+            out.append((f"{indent}└── 🔙 ..", "back", "Go back"))
 
-        return choices
+    def _get_code(self, spec: ModuleSpec) -> CodeType:
+        """
+        Get compiled code for an example, reusing it while the file is unchanged.
+
+        Args:
+            spec: Module spec of the example file
+
+        Returns:
+            Code object ready to be executed in the module namespace
+        """
+        mtime = os.stat(spec.origin).st_mtime_ns
+        cached = self._code_cache.get(spec.origin)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        # get_code goes through __pycache__, so even the first run skips
+        # compilation when the bytecode is already up to date
+        code = spec.loader.get_code(spec.name)
+        self._code_cache[spec.origin] = (mtime, code)
+        return code
 
     def run_example_file(self, file_path: str) -> None:
         """
@@ -102,14 +156,15 @@ class DebugTools:
         Args:
             file_path: Path to the example file
         """
-        self.logger.info(f"\nRunning example: {os.path.basename(file_path)}")
-        self.logger.info("=" * 80)
+        name = os.path.basename(file_path)
+        self.logger.info(f"\nRunning example: {name}")
+        self.logger.info(_SEP)
 
         try:
             spec = importlib.util.spec_from_file_location("example_module", file_path)
             if spec and spec.loader:
                 module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
+                exec(self._get_code(spec), module.__dict__)
 
                 if hasattr(module, 'main'):
                     module.main()
@@ -122,14 +177,26 @@ class DebugTools:
 
         while True:
             # Get current tree level
-            tree = self.get_example_files()
-            for path in current_path:
-                tree = tree[path]
+            if self._tree_cache is None:
+                self._tree_cache = self.get_example_files()
+            tree = self._tree_cache
+            try:
+                for path in current_path:
+                    tree = tree[path]
+            except KeyError:
+                # Directory disappeared after a refresh, start from the top
+                current_path.clear()
+                tree = self._tree_cache
 
             # Create choices for current level
             choices = self.create_choices(tree, "/".join(current_path) + "/" if current_path else "")
 
-            # Add exit option
+            # Add refresh and exit options
+            choices.append(questionary.Choice(
+                title="🔄 Refresh",
+                value="refresh",
+                description="Rescan example files"
+            ))
             choices.append(questionary.Choice(
                 title="❌ Exit",
                 value="exit",
@@ -139,7 +206,7 @@ class DebugTools:
             # Show current path
             current_location = "📂 examples/" + "/".join(current_path) if current_path else "📂 examples"
             self.logger.info(f"\n{current_location}")
-            self.logger.info("=" * 80)
+            self.logger.info(_SEP)
 
             # Show menu
             answer = questionary.select(
@@ -153,6 +220,9 @@ class DebugTools:
 
             if answer == "exit":
                 break
+            elif answer == "refresh":
+                self._tree_cache = None
+                continue
             elif answer == "back":
                 current_path.pop()
                 continue
@@ -1,19 +1,128 @@
 #!/usr/bin/env python3
+import asyncio
+import atexit
+import importlib.util
+import json
+import os
+import re
+import shlex
+import shutil
 import subprocess
+import sys
+import time
+from functools import cached_property
+from importlib.metadata import PackageNotFoundError, distribution, distributions
 from pathlib import Path
-from typing import Optional
-import re
-import questionary
-import semver
-import toml
+from typing import List, Optional, Sequence, Tuple
+
+BUILD_ARTIFACTS = ("dist", "build", "__pycache__", ".pytest_cache", ".mypy_cache")
+
+# Never searched for nested __pycache__ directories by clean_builds
+CLEAN_SKIP_DIRS = frozenset(
+    ("venv", ".venv", "env", ".git", "node_modules", *BUILD_ARTIFACTS)
+)
+
+# Seconds an installed-packages listing stays valid
+PACKAGES_CACHE_TTL = 5
+
+# Left out of the project structure listing
+TREE_IGNORE = frozenset(
+    ("venv", "__pycache__", ".git", ".pytest_cache", "dist", "build")
+)
+TREE_IGNORE_SUFFIXES = (".pyc", ".pyo", ".pyd", ".egg-info")
+
+# Anchored to whole lines so mentions inside docstrings or comments are left alone
+_VERSION_RE = re.compile(r'^__version__\s*=\s*"[^"]*"', re.M)
+_NAME_RE = re.compile(r'^__name__\s*=\s*"[^"]*"', re.M)
+# The version key of the [tool.poetry] table, up to the next table header
+_PYPROJECT_VERSION_RE = re.compile(
+    r'(^\[tool\.poetry\][ \t]*\n(?:(?!^\[).)*?^version\s*=\s*)"[^"]*"', re.M | re.S
+)
+# MAJOR.MINOR.PATCH with an optional "-prefix.N" prerelease, as this project tags them
+_SEMVER_RE = re.compile(
+    r"(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-([0-9A-Za-z-]+)(?:\.(\d+))?)?"
+)
+_SAFETY_LOGIN_RE = re.compile(r"Please login or register Safety CLI")
+
+# Printed by the persistent shell after each command, followed by its exit status
+_END_MARKER = "__DEPLOY_MANAGER_END__"
+_END_RE = re.compile(rf"(.*){_END_MARKER}(\d+)\n?$", re.S)
+
+
+def _parse_porcelain(output: str) -> List[Tuple[str, str]]:
+    """Parse ``git status --porcelain=v2 -z`` output into (XY status, path) pairs."""
+    changes = []
+    records = iter(output.split("\0"))
+    for record in records:
+        kind = record[:1]
+        if kind == "1":
+            fields = record.split(" ", 8)
+            changes.append((fields[1], fields[8]))
+        elif kind == "2":
+            fields = record.split(" ", 9)
+            changes.append((fields[1], fields[9]))
+            # Renames and copies are followed by the original path
+            next(records, None)
+        elif kind == "u":
+            fields = record.split(" ", 10)
+            changes.append((fields[1], fields[10]))
+        elif kind in ("?", "!"):
+            changes.append((kind * 2, record[2:]))
+    return changes
 
 
 class DeployManager:
     def __init__(self):
         self.root_dir = Path(__file__).parent.parent
-        self.package_name = self._get_package_name()
-        self.current_version = self._get_current_version()
-        self.style = questionary.Style(
+        # pyproject.toml as read from disk, and its parsed form
+        self._pyproject_text: Optional[str] = None
+        self._pyproject_data = None
+        # Long-lived bash that run_command feeds, started on first use
+        self._shell: Optional[subprocess.Popen] = None
+        atexit.register(self._close_shell)
+        # Whether the package is known to be installed in this environment
+        self._install_checked = False
+        # pytest-xdist workers: leave a quarter of the cores for everything else
+        self._pytest_jobs = max(1, (os.cpu_count() or 2) * 3 // 4)
+        # (time, rows) of the last installed-packages listing
+        self._packages_cache: Optional[Tuple[float, List[Tuple[str, str]]]] = None
+        # Commit the test suite last passed at, reused between uploads
+        self._tests_ok_at: Optional[str] = None
+        # Whether artifacts may exist that the next build should clean first
+        self._dirty_builds = True
+        # (commit, version) that dist/ was last built from
+        self._built_at: Optional[Tuple[Optional[str], Optional[str]]] = None
+
+        # Menu choices and lookup, rebuilt only when the version shown in labels changes
+        self._menu_choices: list = []
+        self._action_index: dict = {}
+        self._menu_version: Optional[str] = None
+
+    @cached_property
+    def package_name(self) -> str:
+        """Package name, read from pyproject.toml on first access."""
+        return self._get_package_name()
+
+    @cached_property
+    def current_version(self) -> Optional[str]:
+        """Package version, read from pyproject.toml until the next version bump."""
+        return self._get_current_version()
+
+    @cached_property
+    def _pack_path(self) -> Optional[Path]:
+        """The package's __pack__.py, located once per session; None if absent."""
+        for base in (self.root_dir / "src", self.root_dir):
+            path = base / self.package_name / "__pack__.py"
+            if path.exists():
+                return path
+        return None
+
+    @cached_property
+    def style(self):
+        """Questionary style shared by all prompts."""
+        import questionary
+
+        return questionary.Style(
             [
                 ("question", "fg:cyan bold"),
                 ("answer", "fg:yellow"),
@@ -27,8 +136,10 @@ class DeployManager:
             ]
         )
 
-        # Defining command groups
-        self.commands = {
+    @property
+    def commands(self) -> dict:
+        """Command groups, labelled with the current package version."""
+        return {
             "Development": {
                 'Check security': self.check_security,
                 "Check Environment": self.check_environment,
@@ -52,12 +163,19 @@ class DeployManager:
             },
         }
 
+    def _load_pyproject(self) -> dict:
+        """Load pyproject.toml once and reuse the parsed data."""
+        if self._pyproject_data is None:
+            import tomllib
+
+            self._pyproject_text = (self.root_dir / "pyproject.toml").read_text()
+            self._pyproject_data = tomllib.loads(self._pyproject_text)
+        return self._pyproject_data
+
     def _get_package_name(self) -> str:
         """Get package name from pyproject.toml."""
-        pyproject_toml = self.root_dir / "pyproject.toml"
-
         try:
-            data = toml.load(pyproject_toml)
+            data = self._load_pyproject()
             package_name = data["tool"]["poetry"]["name"]
             if not package_name:
                 raise ValueError("Package name not found in pyproject.toml")
@@ -66,56 +184,363 @@ class DeployManager:
         except Exception as e:
             raise ValueError(f"Error reading package name from pyproject.toml: {e}")
 
+    def _get_shell(self) -> subprocess.Popen:
+        """Start the persistent bash process, or reuse it while it is alive."""
+        if self._shell is None or self._shell.poll() is not None:
+            self._shell = subprocess.Popen(
+                ["bash", "-s"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+            )
+        return self._shell
+
+    def _close_shell(self) -> None:
+        """Let the persistent shell exit once the menu is done."""
+        if self._shell is not None and self._shell.poll() is None:
+            self._shell.stdin.close()
+            try:
+                self._shell.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._shell.kill()
+        self._shell = None
+
     def run_command(
-        self, command: str, description: str = "", check: bool = True
+        self,
+        command: str,
+        description: str = "",
+        check: bool = True,
+        stream: bool = False,
+        interactive: bool = False,
     ) -> bool:
-        """Run a shell command and handle errors."""
+        """Run a shell command and handle errors.
+
+        Long-running commands pass ``stream=True`` to print output as it
+        arrives; otherwise output is collected and shown once the command ends.
+        Commands that may prompt (e.g. for credentials) pass ``interactive=True``
+        to run in their own bash attached to the terminal.
+        """
         print(f"\n📋 {description or command}")
+
+        if interactive:
+            returncode = subprocess.run(["bash", "-c", command]).returncode
+            return self._report(returncode, description or command, check)
+
+        # Each command runs in a subshell of the long-lived bash, so `exit` or
+        # `cd` cannot leak into later commands. stdin is detached because the
+        # shell's own stdin carries the commands; the end marker reports $?.
+        # The command reaches the shell as one quoted word for eval, so a
+        # malformed command (e.g. an unterminated quote) fails with status 2
+        # instead of leaving the shell waiting for the rest of it.
+        shell = self._get_shell()
+        shell.stdin.write(
+            f"( eval {shlex.quote(command)} ) 2>&1 </dev/null\n"
+            f"printf '%s%d\\n' {_END_MARKER} $?\n"
+        )
+        shell.stdin.flush()
+
+        returncode = None
+        output = []
+        has_output = False
+        for line in shell.stdout:
+            end = _END_RE.match(line)
+            if end:
+                line = end.group(1)
+                returncode = int(end.group(2))
+            if line:
+                if not line.endswith("\n"):
+                    line += "\n"
+                if not stream:
+                    output.append(line)
+                else:
+                    if not has_output:
+                        print("📤 Output:")
+                    print(line, end="")
+                has_output = True
+            if returncode is not None:
+                break
+
+        if output:
+            # Write the collected lines as they are rather than joining them into
+            # one (possibly very large) string first
+            print("📤 Output:")
+            sys.stdout.writelines(output)
+
+        if returncode is None:
+            # The shell itself went away (e.g. it was killed); start afresh next time
+            returncode = shell.wait()
+            self._shell = None
+
+        return self._report(returncode, description or command, check)
+
+    @staticmethod
+    def _report(returncode: int, description: str, check: bool) -> bool:
+        """Print the outcome of a command and return whether it succeeded."""
+        if returncode == 0:
+            print(f"✅ Success: {description}")
+            return True
+        if check:
+            print(f"❌ Error: {description} exited with status {returncode}")
+        return False
+
+    def _run_batch(self, commands: List[Tuple[str, str]], description: str) -> bool:
+        """Run a group of commands in one shell, stopping at the first failure.
+
+        Each step echoes its own header, so output stays attributed per step.
+        """
+        steps = []
+        for cmd, desc in commands:
+            header = shlex.quote(f"▶ {desc}")
+            failed = shlex.quote(f"❌ Step failed: {desc}")
+            steps.append(f"echo {header}\n{cmd} || {{ echo {failed}; exit 1; }}")
+        return self.run_command("\n".join(steps), description)
+
+    async def _run_async(
+        self, argv: Sequence[str], merge_stderr: bool = True
+    ) -> Tuple[int, str]:
+        """Run a command without a shell and return (exit status, output).
+
+        With ``merge_stderr=False`` only stdout is captured and stderr goes
+        straight to the terminal, for tools whose stdout is machine-readable.
+        """
         try:
-            result = subprocess.run(
-                command, shell=True, check=check, text=True, capture_output=True
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT if merge_stderr else None,
             )
-            if result.stdout:
-                print(f"📤 Output:\n{result.stdout}")
-            if result.returncode == 0:
-                print(f"✅ Success: {description or command}")
-                return True
-            return False
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Error: {e}")
-            print(f"📥 Error output:\n{e.stderr}")
-            return False
+        except OSError as e:
+            # Same status a shell reports for a missing command
+            return 127, f"{e}\n"
+        output, _ = await process.communicate()
+        return process.returncode, output.decode(errors="replace")
+
+    def _run_concurrently(
+        self, commands: List[Tuple[Sequence[str], str]], description: str
+    ) -> bool:
+        """Run independent, read-only commands at the same time.
+
+        Output is printed per step in the given order once all have finished.
+        """
+        print(f"\n📋 {description}")
+
+        async def run_all():
+            return await asyncio.gather(
+                *(self._run_async(cmd) for cmd, _ in commands)
+            )
+
+        ok = True
+        for (_, desc), (returncode, output) in zip(commands, asyncio.run(run_all())):
+            print(f"▶ {desc}")
+            if output:
+                print(output, end="" if output.endswith("\n") else "\n")
+            if returncode != 0:
+                print(f"❌ Step failed: {desc}")
+                ok = False
+
+        if ok:
+            print(f"✅ Success: {description}")
+        return ok
 
     def print_tree(self) -> bool:
         """Print tree of files in current directory."""
-        return self.run_command(
-            "git ls-files --others --exclude-standard --cached | tree --fromfile",
-            "Printing tree of files"
-        )
+        description = "Printing tree of files"
+        print(f"\n📋 {description}")
+        try:
+            paths = subprocess.run(
+                ["git", "ls-files", "--others", "--exclude-standard", "--cached", "-z"],
+                cwd=self.root_dir,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split("\0")
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"❌ Error: {description}: {e}")
+            return False
+
+        # Nested dicts for directories, None for files
+        root: dict = {}
+        for path in paths:
+            if not path:
+                continue
+            *parents, name = path.split("/")
+            node = root
+            for part in parents:
+                node = node.setdefault(part, {})
+            node.setdefault(name, None)
+
+        self._render_tree(root, lambda node: node.items())
+        print(f"✅ Success: {description}")
+        return True
 
     def check_environment(self) -> bool:
         """Check development environment."""
-        commands = [
-            ("poetry --version", "Poetry version"),
-            ("poetry show", "Installed packages"),
-            (
-                "tree -I 'venv|__pycache__|*.pyc|*.pyo|*.pyd|.git|"
-                ".pytest_cache|*.egg-info|dist|build'",
-                "Project structure",
-            ),
-        ]
-        return all(self.run_command(cmd, desc) for cmd, desc in commands)
+        ok = self.run_command("poetry --version", "Poetry version")
+
+        print("▶ Installed packages")
+        packages = self._installed_packages()
+        width = max((len(name) for name, _ in packages), default=0)
+        for name, version in packages:
+            print(f"{name:<{width}} {version}")
+
+        print("▶ Project structure")
+        self._print_tree(self.root_dir)
+        return ok
+
+    def _installed_packages(self) -> List[Tuple[str, str]]:
+        """List (name, version) of installed distributions, cached for a few seconds."""
+        now = time.monotonic()
+        if self._packages_cache and now - self._packages_cache[0] < PACKAGES_CACHE_TTL:
+            return self._packages_cache[1]
+
+        packages = {}
+        for dist in distributions():
+            name = dist.metadata["Name"]
+            # The first match on sys.path is the one that gets imported
+            if name and name not in packages:
+                packages[name] = dist.version
+        rows = sorted(packages.items(), key=lambda row: row[0].lower())
+        self._packages_cache = (now, rows)
+        return rows
+
+    def _print_tree(self, root: Path) -> None:
+        """Print the project layout like `tree`, skipping caches and build output."""
+
+        def children(path) -> list:
+            with os.scandir(path) as it:
+                return [
+                    (
+                        entry.name,
+                        entry.path if entry.is_dir(follow_symlinks=False) else None,
+                    )
+                    for entry in it
+                    # `tree` hides dotfiles unless asked for them
+                    if not entry.name.startswith(".")
+                    and entry.name not in TREE_IGNORE
+                    and not entry.name.endswith(TREE_IGNORE_SUFFIXES)
+                ]
+
+        self._render_tree(root, children)
+
+    @staticmethod
+    def _render_tree(root, children) -> None:
+        """Print a tree the way `tree` does.
+
+        ``children(node)`` returns (name, child) pairs for a directory node, where
+        child is the node to descend into, or None for a file.
+        """
+        def listing(node) -> list:
+            # Reversed, so popping from the end yields names in order
+            return sorted(children(node), key=lambda item: item[0], reverse=True)
+
+        print(".")
+        dirs = files = 0
+        stack = [(listing(root), "")]
+        while stack:
+            entries, prefix = stack[-1]
+            if not entries:
+                stack.pop()
+                continue
+
+            name, child = entries.pop()
+            last = not entries
+            print(f"{prefix}{'└── ' if last else '├── '}{name}")
+            if child is not None:
+                dirs += 1
+                stack.append((listing(child), prefix + ("    " if last else "│   ")))
+            else:
+                files += 1
+
+        print(f"\n{dirs} directories, {files} files")
 
     def install_package(self) -> bool:
         """Install package using Poetry."""
-        return self.run_command("poetry install", "Installing package")
+        self._install_checked = False
+        self._packages_cache = None
+        self._tests_ok_at = None
+        if not self.run_command("poetry install", "Installing package", stream=True):
+            return False
+
+        self._install_checked = True
+        return True
+
+    def _ensure_installed(self) -> bool:
+        """Install the package if it is missing; checked once per session."""
+        if self._install_checked:
+            return True
+
+        try:
+            distribution(self.package_name)
+        except PackageNotFoundError:
+            print(f"\n📦 {self.package_name} is not installed, installing it first...")
+            return self.install_package()
+
+        self._install_checked = True
+        return True
+
+    def _git_head(self) -> Optional[str]:
+        """Get the current git commit, or None outside a git checkout."""
+        try:
+            return subprocess.check_output(
+                ["git", "rev-parse", "HEAD"],
+                cwd=self.root_dir,
+                text=True,
+                stderr=subprocess.DEVNULL,
+            ).strip()
+        except (subprocess.CalledProcessError, OSError):
+            return None
+
+    def _worktree_clean(self) -> bool:
+        """Check that tracked files have no uncommitted changes."""
+        try:
+            status = subprocess.check_output(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                cwd=self.root_dir,
+                text=True,
+                stderr=subprocess.DEVNULL,
+            )
+        except (subprocess.CalledProcessError, OSError):
+            return False
+        return not status
 
     def run_tests(self) -> bool:
         """Run test suite."""
-        return self.run_command(
-            "poetry run pytest -v --cov=src/pydantic2 --cov-report=term-missing tests/",
-            "Running tests with coverage"
-        )
+        self._tests_ok_at = None
+        if not self._ensure_installed():
+            return False
+
+        # Spread test files over worker processes when pytest-xdist is available;
+        # loadfile keeps each file's fixtures on a single worker
+        parallel = ""
+        if self._pytest_jobs > 1 and importlib.util.find_spec("xdist"):
+            parallel = f"-n {self._pytest_jobs} --dist=loadfile "
+
+        # A run over uncommitted edits says nothing about the commit itself,
+        # so only a clean tree's result is kept for reuse
+        clean = self._worktree_clean()
+
+        if not self.run_command(
+            f"poetry run pytest {parallel}-v --cov=src/pydantic2 "
+            "--cov-report=term-missing tests/",
+            "Running tests with coverage",
+            stream=True,
+        ):
+            return False
+
+        if clean:
+            self._tests_ok_at = self._git_head()
+        return True
+
+    def _ensure_tests_passed(self) -> bool:
+        """Run tests unless they already passed at the current commit."""
+        head = self._git_head()
+        if head and head == self._tests_ok_at and self._worktree_clean():
+            print("✅ Tests already passed at this commit")
+            return True
+        return self.run_tests()
 
     def format_code(self) -> bool:
         """Format code using black and isort."""
@@ -123,18 +548,23 @@ class DeployManager:
             ("poetry run black .", "Formatting with black"),
             ("poetry run isort .", "Sorting imports"),
         ]
-        return all(self.run_command(cmd, desc) for cmd, desc in commands)
+        # Formatting may rewrite sources, so earlier test results no longer apply
+        self._tests_ok_at = None
+        return self._run_batch(commands, "Formatting code")
 
     def check_lint(self) -> bool:
         """Run linting checks."""
         commands = [
-            ("poetry run flake8 .", "Running flake8"),
-            ("poetry run mypy .", "Running type checks")
+            (["poetry", "run", "flake8", "."], "Running flake8"),
+            (["poetry", "run", "mypy", "."], "Running type checks"),
         ]
-        return all(self.run_command(cmd, desc) for cmd, desc in commands)
+        # Neither tool modifies files, so they can share the wall-clock time
+        return self._run_concurrently(commands, "Running linters")
 
     def check_security(self) -> bool:
         """Run security audit on dependencies using multiple tools."""
+        import questionary
+
         print("\n🔍 Running security checks...")
 
         # Create reports directory if it doesn't exist
@@ -145,11 +575,45 @@ class DeployManager:
         from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        # Run pip-audit for Python-specific vulnerabilities
-        print("\n📦 Checking with pip-audit:")
         pip_audit_report = reports_dir / f"pip_audit_{timestamp}.json"
-        pip_audit_cmd = f"poetry run pip-audit --local --format json -o {pip_audit_report}"
-        has_pip_audit_issues = not self.run_command(pip_audit_cmd, "Running pip-audit check")
+        safety_report = reports_dir / f"safety_{timestamp}.txt"
+
+        # Both audits only read the resolved dependencies, so run them side by side
+        async def run_audits():
+            return await asyncio.gather(
+                self._run_async(
+                    ["poetry", "run", "pip-audit", "--local", "--format", "json"],
+                    merge_stderr=False,
+                ),
+                self._run_async(["poetry", "run", "safety", "scan", "--short-report"]),
+            )
+
+        (pip_audit_code, pip_audit_output), (safety_code, safety_output) = (
+            asyncio.run(run_audits())
+        )
+
+        # Report pip-audit for Python-specific vulnerabilities
+        print("\n📦 Checking with pip-audit:")
+        pip_audit_report.write_text(pip_audit_output)
+        try:
+            vulnerable = [
+                dep for dep in json.loads(pip_audit_output).get("dependencies", [])
+                if dep.get("vulns")
+            ]
+        except ValueError:
+            # Not a JSON report (e.g. the tool failed to start), show it as is
+            if pip_audit_output:
+                print(f"📤 Output:\n{pip_audit_output}", end="")
+        else:
+            print(f"📤 {len(vulnerable)} vulnerable package(s)")
+            for dep in vulnerable:
+                ids = ", ".join(vuln.get("id", "?") for vuln in dep["vulns"])
+                print(f"  - {dep.get('name')} {dep.get('version')}: {ids}")
+        has_pip_audit_issues = pip_audit_code != 0
+        if has_pip_audit_issues:
+            print(f"❌ Error: pip-audit check exited with status {pip_audit_code}")
+        else:
+            print("✅ Success: Running pip-audit check")
 
         # If pip-audit found issues, offer to fix them
         if has_pip_audit_issues:
@@ -159,39 +623,27 @@ class DeployManager:
                 fix_cmd = "poetry run pip-audit --fix"
                 self.run_command(fix_cmd, "Attempting to fix vulnerabilities", check=False)
 
-        # Run safety scan with basic output
+        # Report safety scan with basic output
         print("\n🔒 Checking with Safety CLI:")
-        safety_report = reports_dir / f"safety_{timestamp}.txt"
-        safety_cmd = f"poetry run safety scan --short-report | tee {safety_report}"
-        result = subprocess.run(safety_cmd, shell=True, text=True, capture_output=True)
+        safety_report.write_text(safety_output)
 
         # Check if Safety CLI requires login
-        if "Please login or register Safety CLI" in result.stdout or \
-           "Please login or register Safety CLI" in result.stderr:
+        needs_login = bool(_SAFETY_LOGIN_RE.search(safety_output))
+        if needs_login:
             print("\n⚠️  Safety CLI requires authentication")
             print("📝 To use Safety CLI, you need to:")
             print("1. Register for a free account at https://safetycli.com")
             print("2. Login using 'safety auth login'")
             print("3. Run the security check again")
-
-            # Save the login prompt for reference
-            with open(safety_report, 'w') as f:
-                f.write(result.stdout)
-                if result.stderr:
-                    f.write("\nError output:\n")
-                    f.write(result.stderr)
-
             print(f"\n📋 Login prompt saved to: {safety_report}")
             has_safety_issues = True
         else:
-            has_safety_issues = result.returncode != 0
-            if result.stdout:
-                print(f"📤 Output:\n{result.stdout}")
-            if result.stderr:
-                print(f"📥 Error output:\n{result.stderr}")
+            has_safety_issues = safety_code != 0
+            if safety_output:
+                print(f"📤 Output:\n{safety_output}")
 
         # If issues found and we're authenticated, offer quick fixes
-        if has_safety_issues and "Please login or register Safety CLI" not in result.stdout:
+        if has_safety_issues and not needs_login:
             if questionary.confirm("Would you like to attempt automatic fixes?").ask():
                 fix_level = questionary.select(
                     "Select maximum version update level for automatic fixes:",
@@ -224,88 +676,160 @@ class DeployManager:
 
     def show_changes(self) -> bool:
         """Show current git changes."""
-        commands = [
-            ("git status", "Current git status"),
-            ("git diff", "Current changes"),
-        ]
-        return all(self.run_command(cmd, desc) for cmd, desc in commands)
+        import questionary
+
+        print("\n📋 Showing changes")
+
+        async def run_all():
+            return await asyncio.gather(
+                # --no-optional-locks keeps status from taking index.lock while
+                # diff reads the index at the same time
+                self._run_async(
+                    ["git", "--no-optional-locks", "status", "--porcelain=v2", "-z"]
+                ),
+                # Against HEAD, so staged edits are summarised along with unstaged ones
+                self._run_async(["git", "--no-pager", "diff", "HEAD", "--stat"]),
+            )
+
+        (status_code, status), (_, summary) = asyncio.run(run_all())
+        if status_code != 0:
+            print(f"❌ Error: git status failed\n{status}", end="")
+            return False
+
+        changes = _parse_porcelain(status)
+        if not changes:
+            print("✅ Working tree clean")
+            return True
+
+        print("▶ Changed files")
+        for xy, path in changes:
+            print(f"  {xy} {path}")
+        if summary:
+            print("▶ Change summary")
+            print(summary, end="")
+
+        # Full diffs can be huge, so only show them for the files asked for
+        tracked = [path for xy, path in changes if xy not in ("??", "!!")]
+        while tracked:
+            path = questionary.select(
+                "Show full diff for:",
+                choices=tracked + ["Done"],
+                style=self.style,
+            ).ask()
+            if not path or path == "Done":
+                break
+            self.run_command(
+                f"git --no-pager diff HEAD -- {shlex.quote(path)}", f"Changes in {path}"
+            )
+
+        return True
 
     def clean_builds(self) -> bool:
         """Clean all build artifacts."""
-        return self.run_command(
-            "rm -rf dist build *.egg-info __pycache__ .pytest_cache .mypy_cache",
-            "Cleaning build artifacts"
-        )
+        print("\n📋 Cleaning build artifacts")
+        self._built_at = None
+        targets = [self.root_dir / name for name in BUILD_ARTIFACTS]
+        targets.extend(self.root_dir.glob("*.egg-info"))
+        # Nested bytecode caches, without descending into environments or .git
+        for dirpath, dirnames, _ in os.walk(self.root_dir):
+            if "__pycache__" in dirnames:
+                targets.append(Path(dirpath) / "__pycache__")
+            dirnames[:] = [name for name in dirnames if name not in CLEAN_SKIP_DIRS]
+        for target in targets:
+            if target.is_dir():
+                shutil.rmtree(target, ignore_errors=True)
+            elif target.exists():
+                target.unlink()
+        self._dirty_builds = False
+        print("✅ Success: Cleaning build artifacts")
+        return True
 
     def build_package(self) -> bool:
         """Build package distributions."""
-        if not self.clean_builds():
+        if self._dirty_builds and not self.clean_builds():
             return False
 
-        return self.run_command("poetry build", "Building package")
+        # A build of uncommitted edits is not tied to any commit, so it is not
+        # recorded for reuse
+        clean = self._worktree_clean()
 
-    def upload_to_testpypi(self) -> bool:
-        """Upload package to TestPyPI."""
-        if not questionary.confirm(
-            "Are you sure you want to upload to TestPyPI?"
-        ).ask():
+        # Even a failed build can leave partial artifacts behind
+        self._dirty_builds = True
+        if not self.run_command("poetry build", "Building package", stream=True):
             return False
 
-        print("\n🧪 Running tests before uploading to TestPyPI...")
-        if not self.run_tests():
-            print("❌ Tests failed! Aborting upload to TestPyPI.")
-            return False
+        if clean:
+            self._built_at = (self._git_head(), self.current_version)
+        return True
 
-        print("\n🔒 Running security audit...")
+    def _ensure_built(self) -> bool:
+        """Build unless dist/ already holds this commit's build of the current version."""
+        head = self._git_head()
+        if (
+            head
+            and self._built_at == (head, self.current_version)
+            and any((self.root_dir / "dist").glob(f"*{self.current_version}*"))
+            and self._worktree_clean()
+        ):
+            print("✅ Package already built at this commit")
+            return True
+        return self.build_package()
 
-        if questionary.confirm("Do you want to run the security audit?").ask():
-            if not self.check_security():
-                print("❌ Security audit failed! Please review the vulnerabilities above.")
-                if not questionary.confirm("Continue despite security warnings?").ask():
-                    return False
+    def _upload(self, index: str, publish_command: str) -> bool:
+        """Test, optionally audit, build and publish to the given package index."""
+        import questionary
 
-        print("\n🔨 Tests passed! Building package...")
-        if not self.build_package():
-            print("❌ Package build failed! Aborting upload to TestPyPI.")
+        if not questionary.confirm(f"Are you sure you want to upload to {index}?").ask():
             return False
 
-        return self.run_command(
-            "poetry publish -r testpypi", "Uploading to TestPyPI"
-        )
+        # Ask everything up front so the long steps below run unattended
+        run_audit = questionary.confirm("Do you want to run the security audit?").ask()
 
-    def upload_to_pypi(self) -> bool:
-        """Upload package to PyPI."""
-        if not questionary.confirm("Are you sure you want to upload to PyPI?").ask():
+        print(f"\n🧪 Running tests before uploading to {index}...")
+        if not self._ensure_tests_passed():
+            print(f"❌ Tests failed! Aborting upload to {index}.")
             return False
 
-        print("\n🧪 Running tests before uploading to PyPI...")
-        if not self.run_tests():
-            print("❌ Tests failed! Aborting upload to PyPI.")
-            return False
-
-        print("\n🔒 Running security audit...")
-        if questionary.confirm("Do you want to run the security audit?").ask():
+        if run_audit:
+            print("\n🔒 Running security audit...")
             if not self.check_security():
                 print("❌ Security audit failed! Please review the vulnerabilities above.")
                 if not questionary.confirm("Continue despite security warnings?").ask():
                     return False
 
         print("\n🔨 Tests passed! Building package...")
-        if not self.build_package():
-            print("❌ Package build failed! Aborting upload to PyPI.")
+        if not self._ensure_built():
+            print(f"❌ Package build failed! Aborting upload to {index}.")
             return False
 
-        return self.run_command("poetry publish", "Uploading to PyPI")
+        # Publishing may prompt for credentials, so it keeps the terminal's stdin
+        return self.run_command(
+            publish_command, f"Uploading to {index}", interactive=True
+        )
+
+    def upload_to_testpypi(self) -> bool:
+        """Upload package to TestPyPI."""
+        return self._upload("TestPyPI", "poetry publish -r testpypi")
+
+    def upload_to_pypi(self) -> bool:
+        """Upload package to PyPI."""
+        return self._upload("PyPI", "poetry publish")
 
     def update_version(self) -> bool:
         """Update package version."""
+        import questionary
+
         current_version = self._get_current_version()
         if not current_version:
             return False
 
         try:
             # Parse current version
-            ver = semver.Version.parse(current_version)
+            match = _SEMVER_RE.fullmatch(current_version)
+            if not match:
+                raise ValueError(f"{current_version} is not a valid version")
+            major, minor, patch = (int(part) for part in match.group(1, 2, 3))
+            prefix, number = match.group(4, 5)
             print(f"\n📦 Current version: {current_version}")
 
             # Always show version type selection
@@ -316,23 +840,26 @@ class DeployManager:
             ).ask()
 
             # If it's a prerelease version, increment the prerelease number
-            if ver.prerelease:
-                prefix = str(ver.prerelease).split('.')[0]
-                number = int(str(ver.prerelease).split('.')[1])
+            if prefix:
                 new_version = (
-                    f"{ver.major}.{ver.minor}.{ver.patch}-{prefix}.{number + 1}"
+                    f"{major}.{minor}.{patch}-{prefix}.{int(number or 0) + 1}"
                 )
             else:
                 # For stable versions, increment version number
                 if increment_type == "patch":
-                    ver = ver.bump_patch()
+                    patch += 1
                 elif increment_type == "minor":
-                    ver = ver.bump_minor()
+                    minor, patch = minor + 1, 0
                 elif increment_type == "major":
-                    ver = ver.bump_major()
-                new_version = str(ver)
+                    major, minor, patch = major + 1, 0, 0
+                new_version = f"{major}.{minor}.{patch}"
 
             self._update_version_in_files(new_version)
+            # Re-read on next access so the labels match what was written
+            self.__dict__.pop("current_version", None)
+            self._tests_ok_at = None
+            # The installed metadata still carries the old version
+            self._install_checked = False
             print(f"✅ Version updated: {current_version} → {new_version}")
             return True
 
@@ -348,7 +875,7 @@ class DeployManager:
             return None
 
         try:
-            data = toml.load(pyproject_toml)
+            data = self._load_pyproject()
             version = data["tool"]["poetry"]["version"]
             if not version:
                 print("❌ Version not found in pyproject.toml")
@@ -359,6 +886,16 @@ class DeployManager:
             print(f"❌ Error reading pyproject.toml: {e}")
             return None
 
+    @staticmethod
+    def _write_atomic(path: Path, text: str) -> None:
+        """Write a file via a temporary sibling so an interrupt cannot truncate it."""
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        try:
+            tmp.write_text(text)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
     def _update_version_in_files(self, new_version: str) -> None:
         """Update version in configuration files."""
         module_name = self.package_name
@@ -367,69 +904,84 @@ class DeployManager:
         # Update pyproject.toml
         if pyproject_toml.exists():
             try:
-                data = toml.load(pyproject_toml)
+                data = self._load_pyproject()
+                # Edit only the version line so the rest of the file keeps its
+                # formatting and comments byte for byte
+                text, found = _PYPROJECT_VERSION_RE.subn(
+                    rf'\g<1>"{new_version}"', self._pyproject_text, count=1
+                )
+                if not found:
+                    raise ValueError("version not found in [tool.poetry]")
+                if text != self._pyproject_text:
+                    self._write_atomic(pyproject_toml, text)
                 data["tool"]["poetry"]["version"] = new_version
-
-                with open(pyproject_toml, "w") as f:
-                    toml.dump(data, f)
+                self._pyproject_text = text
             except Exception as e:
+                # Drop the cache so the next read reflects what is on disk
+                self._pyproject_text = None
+                self._pyproject_data = None
                 print(f"❌ Error updating pyproject.toml: {e}")
 
         # Update version in __pack__.py if it exists
-        init_path = self.root_dir / "src" / module_name / "__pack__.py"
-
-        # update __pack__.py
-        if init_path.exists():
-            with open(init_path) as f:
-                content = f.read()
+        init_path = self._pack_path
+        if init_path is not None:
+            original = init_path.read_text()
 
             # update __version__
-            content = re.sub(
-                r'__version__ = ".*"',
-                f'__version__ = "{new_version}"',
-                content
-            )
+            content, found = _VERSION_RE.subn(f'__version__ = "{new_version}"', original)
+            if not found:
+                print(f"⚠️  No __version__ assignment found in {init_path}")
 
             # update __name__
-            content = re.sub(
-                r'__name__ = ".*"',
-                f'__name__ = "{module_name}"',
-                content
-            )
+            content = _NAME_RE.sub(f'__name__ = "{module_name}"', content)
+
+            # Leave the file (and its mtime) alone when nothing changed
+            if content != original:
+                self._write_atomic(init_path, content)
+
+    def _refresh_menu(self) -> None:
+        """Rebuild menu choices and the label → handler index when the version label changes."""
+        if self._menu_choices and self._menu_version == self.current_version:
+            return
+
+        import questionary
 
-            with open(init_path, "w") as f:
-                f.write(content)
+        choices = []
+        self._action_index = {}
+        for group, commands in self.commands.items():
+            if choices:
+                choices.append(questionary.Separator())
+            choices.append(questionary.Separator(f"━━ {group} ━━"))
+            choices.extend(commands.keys())
+            self._action_index.update(commands)
+
+        choices.extend([questionary.Separator("━" * 30), "Exit"])
+        self._menu_choices = choices
+        self._menu_version = self.current_version
 
     def show_menu(self) -> None:
         """Display interactive menu."""
-        while True:
-            choices = []
-            for group, commands in self.commands.items():
-                if choices:
-                    choices.append(questionary.Separator())
-                choices.append(questionary.Separator(f"━━ {group} ━━"))
-                choices.extend(list(commands.keys()))
-
-            choices.extend([questionary.Separator("━" * 30), "Exit"])
+        import questionary
 
+        while True:
+            self._refresh_menu()
             action = questionary.select(
                 message=f"{self.package_name.upper()} v{self.current_version}",
-                choices=choices,
+                choices=self._menu_choices,
                 style=self.style,
             ).ask()
 
             if not action or action == "Exit":
                 break
 
-            for commands in self.commands.values():
-                if action in commands:
-                    try:
-                        commands[action]()
-                    except Exception as e:
-                        print(f"❌ Error: {e}")
-                        if not questionary.confirm("Continue?", style=self.style).ask():
-                            return
-                    break
+            handler = self._action_index.get(action)
+            if handler:
+                try:
+                    handler()
+                except Exception as e:
+                    print(f"❌ Error: {e}")
+                    if not questionary.confirm("Continue?", style=self.style).ask():
+                        return
 
 
 if __name__ == "__main__":
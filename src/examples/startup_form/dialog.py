@@ -1,4 +1,5 @@
 from typing import List, Optional
+import logging
 from pydantic import BaseModel, Field
 
 from pydantic2.agents.progress_form import BaseProgressForm
@@ -25,6 +26,26 @@ class StartupFormResponse(BaseModel):
     )
 
 
+class StartupFormBatchResponse(BaseModel):
+    """Response format for analysing several startup forms in one request"""
+    analyses: List[StartupFormResponse] = Field(
+        description="One analysis per STARTUP_INFO block, in the same order"
+    )
+
+
+ANALYST_PROMPT = """
+You are a startup analyst. Generate a comprehensive analysis:
+1. Evaluate overall viability (0-10)
+2. List 3-5 key strengths
+3. List 2-3 areas for improvement
+4. Suggest 2-3 specific next steps
+5. Score market potential (0-10)
+"""
+
+# Forms per batched request; larger batches save prompt tokens but lose accuracy
+BATCH_SIZE = 8
+
+
 class StartupFormProcessor(BaseProgressForm):
     """Processor for startup form data"""
 
@@ -57,28 +78,8 @@ class StartupFormProcessor(BaseProgressForm):
         message: str,
     ) -> StartupFormResponse:
         """Analyze complete startup info when form is complete"""
-        client = self._get_tool_client(temperature=0.7)
-
-        client.message_handler.add_message_system(
-            """
-            You are a startup analyst. Generate a comprehensive analysis:
-            1. Evaluate overall viability (0-10)
-            2. List 3-5 key strengths
-            3. List 2-3 areas for improvement
-            4. Suggest 2-3 specific next steps
-            5. Score market potential (0-10)
-            """
-        )
-
-        client.message_handler.add_message_block(
-            "STARTUP_INFO",
-            self.current_state.form.model_dump()
-        )
-
         try:
-            result: StartupFormResponse = client.generate(
-                result_type=StartupFormResponse
-            )
+            result = self._analyze_form(self.current_state.form)
 
             print("\n")
             print("="*50)
@@ -91,9 +92,56 @@ class StartupFormProcessor(BaseProgressForm):
         except Exception as e:
             raise Exception(f"Error analyzing startup: {str(e)}")
 
+    def analyze_startups(
+        self,
+        forms: List[StartupForm],
+        batch_size: int = BATCH_SIZE,
+    ) -> List[StartupFormResponse]:
+        """Analyze many startups, sharing one system prompt per batch of forms"""
+        results: List[StartupFormResponse] = []
+        for start in range(0, len(forms), batch_size):
+            batch = forms[start:start + batch_size]
+            try:
+                analyses = self._analyze_batch(batch)
+            except Exception:
+                analyses = []
+            if len(analyses) != len(batch):
+                # Batch answer unusable, analyze these forms one by one
+                analyses = [self._analyze_form(form) for form in batch]
+            results.extend(analyses)
+        return results
+
+    def _analyze_form(self, form: StartupForm) -> StartupFormResponse:
+        """Request the analysis of a single startup form"""
+        client = self._get_tool_client(temperature=0.7)
+        client.message_handler.add_message_system(ANALYST_PROMPT)
+        client.message_handler.add_message_block("STARTUP_INFO", form.model_dump())
+        return client.generate(result_type=StartupFormResponse)
+
+    def _analyze_batch(self, forms: List[StartupForm]) -> List[StartupFormResponse]:
+        """Request the analyses of several startup forms in one call"""
+        if len(forms) == 1:
+            return [self._analyze_form(forms[0])]
+
+        client = self._get_tool_client(temperature=0.7)
+        client.message_handler.add_message_system(
+            ANALYST_PROMPT
+            + f"Analyze each of the {len(forms)} STARTUP_INFO blocks separately "
+            "and return the analyses in the same order."
+        )
+        for i, form in enumerate(forms, 1):
+            client.message_handler.add_message_block(
+                f"STARTUP_INFO_{i}", form.model_dump()
+            )
+        result: StartupFormBatchResponse = client.generate(
+            result_type=StartupFormBatchResponse
+        )
+        return result.analyses
+
 
 def main():
     """Example usage of StartupFormProcessor"""
+    logging.basicConfig(level=logging.INFO)
     processor = StartupFormProcessor(user_id="test_user")
     processor.run_test_dialog()
 
@@ -3,6 +3,7 @@ from typing import List, Optional
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import time
+import logging
 
 load_dotenv()
 
@@ -244,6 +245,7 @@ class StartupFormProcessor(BaseProgressForm):
 
 def main(session_id: str = None):
     """Example usage of StartupFormProcessor"""
+    logging.basicConfig(level=logging.INFO)
     user_id = "test_user"
 
     # Create processor instance
@@ -2,12 +2,11 @@ from typing import List, Callable, Optional, TypeVar, Generic
 from pydantic import BaseModel, Field, ConfigDict
 from pydantic2 import PydanticAIClient, ModelSettings
 import logging
-import inspect
+import sys
 from abc import ABC
+from functools import cached_property
 from .session_db_manager import SessionDBManager
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -44,7 +43,13 @@ class FormState(BaseModel, Generic[FormT]):
     user_language: str = Field(default="", description="User's language (iso639-1)")
 
 class BaseProgressForm(ABC):
-    """Base class for processing form data with AI assistance"""
+    """Base class for processing form data with AI assistance
+
+    The form is validated again from the stored dict every time a session is
+    restored. Annotate long list fields of form_class with
+    Annotated[list[X], FailFast()] (from pydantic) so validation stops at the
+    first bad item instead of checking the whole list.
+    """
 
     def __init__(
         self,
@@ -64,7 +69,9 @@ class BaseProgressForm(ABC):
         self.verbose = verbose
         self.verbose_clients = verbose_clients
         self.form_class = form_class
-        self._state_dirty = False
+
+        # Hash of the last state written to the DB, to skip no-op saves
+        self._last_saved_hash: Optional[int] = None
 
         # Client pool to reduce instantiation overhead
         self._client_pool = {}
@@ -101,29 +108,73 @@ class BaseProgressForm(ABC):
         )
 
         if not session:
-            self._log("Failed to initialize session", "error")
+            self._log("Failed to initialize session", level="error")
             return
 
         # Try to get the latest state
         self._restore_latest_state_from_db()
 
+        # History is only read for the verbose log below, skip the query otherwise
+        if not self.verbose:
+            return
+
         # If this is a new session (no history), save initial state
         history = self.db_manager.get_state_history()
         # if not history:
         #     self._log("New session detected, saving initial state")
         #     self.current_state.next_question = "Tell me about your startup idea."
-        #     self._state_dirty = True
         #     self.save_current_state()
         #     history = self.db_manager.get_state_history()
 
         # Get state history for logging
-        self._log(f"States in history: {len(history)}")
+        self._log("States in history: %d", len(history))
         for i, state in enumerate(history, 1):
-            self._log(f"State {i}:")
-            self._log(f"  Progress: {state.get('state', {}).get('progress', 'None')}%")
-            self._log(f"  Question: {state.get('state', {}).get('prev_question', 'None')}")
-            self._log(f"  Answer: {state.get('state', {}).get('prev_answer', 'None')}")
-            self._log(f"  Timestamp: {state.get('timestamp', 'None')}")
+            self._log("State %d:", i)
+            self._log("  Progress: %s%%", state.get('state', {}).get('progress', 'None'))
+            self._log("  Question: %s", state.get('state', {}).get('prev_question', 'None'))
+            self._log("  Answer: %s", state.get('state', {}).get('prev_answer', 'None'))
+            self._log("  Timestamp: %s", state.get('timestamp', 'None'))
+
+    @property
+    def current_state(self) -> FormState:
+        """Current form state"""
+        return self._current_state
+
+    @current_state.setter
+    def current_state(self, state: FormState):
+        self._current_state = state
+        self._state_dump = None
+
+    def _get_state_dump(self) -> dict:
+        """Dump of current_state, cached until current_state is reassigned"""
+        if self._state_dump is None:
+            self._state_dump = self.current_state.model_dump()
+        return self._state_dump
+
+    @cached_property
+    def _state_cls(self) -> type[FormState]:
+        """FormState parametrized with this form's class"""
+        return FormState[self.form_class]
+
+    def _hydrate_state_from_dict(self, state_data: dict) -> FormState:
+        """Build form state from a stored state dict"""
+        get = state_data.get
+
+        # Restore form from state data
+        form = self.form_class.model_validate(get('form', {}))
+
+        # Create state with restored form
+        return self._state_cls.model_validate({
+            'form': form,
+            'progress': get('progress', 0),
+            'prev_question': get('prev_question', ''),
+            'prev_answer': get('prev_answer', ''),
+            'feedback': get('feedback', ''),
+            'confidence': get('confidence', 0.0),
+            'next_question': get('next_question', ''),
+            'next_question_explanation': get('next_question_explanation', ''),
+            'user_language': get('user_language', ''),
+        })
 
     def _restore_latest_state_from_db(self):
         """Restore latest state from database with error handling"""
@@ -131,34 +182,33 @@ class BaseProgressForm(ABC):
 
         if state_data:
             try:
-                # Restore form from state data
-                form_data = state_data.get('form', {})
-                form = self.form_class(**form_data)
-
-                # Create state with restored form
-                self.current_state = FormState[self.form_class](
-                    form=form,
-                    progress=state_data.get('progress', 0),
-                    prev_question=state_data.get('prev_question', ''),
-                    prev_answer=state_data.get('prev_answer', ''),
-                    feedback=state_data.get('feedback', ''),
-                    confidence=state_data.get('confidence', 0.0),
-                    next_question=state_data.get('next_question', ''),
-                    next_question_explanation=state_data.get(
-                        'next_question_explanation', ''
-                    ),
-                    user_language=state_data.get('user_language', '')
-                )
+                self.current_state = self._hydrate_state_from_dict(state_data)
                 self._log("Restored session state")
-                self._state_dirty = False
+                self._last_saved_hash = hash(self.current_state.model_dump_json())
                 return
             except Exception as e:
-                self._log(f"Error restoring session: {e}", level="warning")
+                self._log("Error restoring session: %s", e, level="warning")
 
         # Initialize new state if could not restore
-        self.current_state = FormState[self.form_class](form=self.form_class())
+        self.current_state = self._state_cls(form=self.form_class())
         self._log("Initialized new session state")
-        self._state_dirty = True
+        self._last_saved_hash = None
+
+    @cached_property
+    def _form_fields_block(self) -> str:
+        """Form fields description, built once since form_class never changes"""
+        form_fields = []
+        for field_name, field in self.form_class.__annotations__.items():
+            field_type = field.__name__ if hasattr(field, "__name__") else str(field)
+            field_obj = self.form_class.model_fields.get(field_name, {})
+
+            description = ""
+            if hasattr(field_obj, "description") and field_obj.description:
+                description = field_obj.description
+
+            form_fields.append(f"- {field_name}: {field_type} - {description}")
+
+        return "Form fields:\n" + "\n".join(form_fields)
 
     def process_form(
         self,
@@ -203,26 +253,9 @@ class BaseProgressForm(ABC):
         )
 
         # Add form class definition
-        form_fields = []
-        for field_name, field in self.form_class.__annotations__.items():
-            field_type = field.__name__ if hasattr(field, "__name__") else str(field)
-            field_obj = self.form_class.model_fields.get(field_name, {})
-
-            description = ""
-            if hasattr(field_obj, "description") and field_obj.description:
-                description = field_obj.description
-
-            form_fields.append(f"- {field_name}: {field_type} - {description}")
-
         client.message_handler.add_message_block(
             "FORM_STRUCTURE",
-            "Form fields:\n" + "\n".join(form_fields)
-        )
-
-        # Add current form state
-        client.message_handler.add_message_block(
-            "CURRENT_STATE",
-            self.current_state.model_dump(),
+            self._form_fields_block
         )
 
         # Add custom rules for form processing
@@ -236,11 +269,18 @@ class BaseProgressForm(ABC):
             """
         )
 
+        # Add current form state after the static blocks above, so the prompt
+        # starts with the same text on every turn and providers can cache it
+        client.message_handler.add_message_block(
+            "CURRENT_STATE",
+            self._get_state_dump(),
+        )
+
         # Add user message
         client.message_handler.add_message_user(message)
 
         # Process and get updated state
-        result = client.generate(result_type=FormState[self.form_class])
+        result = client.generate(result_type=self._state_cls)
 
         # Store history of Q&A
         result.prev_question = self.current_state.next_question
@@ -260,14 +300,15 @@ class BaseProgressForm(ABC):
             self._log("No current_state to save", level="warning")
             return
 
-        if not self._state_dirty:
+        # Serialize once, both to compare with the last save and to store
+        state_json = self.current_state.model_dump_json()
+        state_hash = hash(state_json)
+        if state_hash == self._last_saved_hash:
             self._log("State unchanged, skipping save", level="debug")
             return
 
-        # Convert state to dict and save
-        state_dict = self.current_state.model_dump()
-        if self.db_manager.save_state(state_dict):
-            self._state_dirty = False
+        if self.db_manager.save_state(state_json):
+            self._last_saved_hash = state_hash
             self._log("Successfully saved state")
         else:
             self._log("Failed to save state", level="error")
@@ -287,7 +328,7 @@ class BaseProgressForm(ABC):
 
     def _process_message(self, message: str) -> str:
         """Internal method to process a form message and get a response"""
-        self._log(f"Processing message: {message}")
+        self._log("Processing message: %s", message)
 
         # Process using test agent
         result = self._process_with_test_agent(message)
@@ -304,7 +345,7 @@ class BaseProgressForm(ABC):
         """Print initialization information"""
         self._log("\n🛠️ Initialized tools:")
         for tool in self.tools:
-            self._log(f"  - {tool.__name__}: {tool.__doc__ or 'No description'}")
+            self._log("  - %s: %s", tool.__name__, tool.__doc__ or 'No description')
 
     @property
     def tools(self) -> List[Callable]:
@@ -366,11 +407,15 @@ class BaseProgressForm(ABC):
         temperature: float = 0.1
     ):
         """Get client for specific tool execution with client pooling"""
-        caller_name = inspect.stack()[1].function
-        client_key = f'{model_name}_{caller_name}_{temperature}'
+        caller_name = sys._getframe(1).f_code.co_name
+        client_key = (model_name, caller_name, temperature)
 
-        if client_key in self._client_pool:
-            return self._client_pool[client_key]
+        client = self._client_pool.get(client_key)
+        if client is not None:
+            # generate() clears messages itself, but not when it fails before
+            # the request (e.g. budget check), so start every call clean
+            client.message_handler.clear()
+            return client
 
         client = PydanticAIClient(
             model_name=model_name,
@@ -458,7 +503,7 @@ class BaseProgressForm(ABC):
 
         self.test_agent_client.message_handler.add_message_block(
             "CURRENT_STATE",
-            self.current_state.model_dump(),
+            self._get_state_dump(),
         )
 
         # Generate response
@@ -476,7 +521,7 @@ class BaseProgressForm(ABC):
 
         # Get response from test agent
         response = self.get_test_agent_response()
-        self._log(f"Test agent response: {response}")
+        self._log("Test agent response: %s", response)
 
         return response
 
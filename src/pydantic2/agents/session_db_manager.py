@@ -183,11 +183,11 @@ class SessionDBManager:
         self._log(f"Using current session: {self._session.id}")
         return self._session
 
-    def save_state(self, state_data: dict) -> bool:
+    def save_state(self, state_data: Union[dict, str]) -> bool:
         """Save current state to database
 
         Args:
-            state_data: State data to save
+            state_data: State data to save, as a dict or a JSON string
 
         Returns:
             bool: True if state was saved successfully
@@ -1,27 +1,80 @@
-from typing import Any
-import yaml
+from functools import lru_cache
+from typing import Any, NamedTuple
+import html
 import re
-from bs4 import BeautifulSoup
 import json
 from pydantic import BaseModel
 from ..utils.logger import logger
 
+try:
+    import orjson
+
+    def _dump_json(data: Any) -> str:
+        return orjson.dumps(data).decode()
+except ImportError:
+    def _dump_json(data: Any) -> str:
+        # Same output as orjson, so prompts do not depend on what is installed
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+@lru_cache(maxsize=None)
+def _html_parser() -> str:
+    """Pick the BeautifulSoup parser on first use."""
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return "html.parser"
+    # C-backed tree builder, several times faster than the pure-Python parser
+    return "lxml"
+
+
+@lru_cache(maxsize=None)
+def _yaml_dumper(container: bool) -> type:
+    """Import PyYAML on first use; prefer the LibYAML emitter for dicts and lists.
+
+    For a bare scalar the LibYAML emitter leaves out the '...' document end
+    marker that the pure-Python one writes, so scalars always use the latter.
+    """
+    import yaml
+
+    if container:
+        return getattr(yaml, "CDumper", yaml.Dumper)
+    return yaml.Dumper
+
+
+# Markup whose text BeautifulSoup's get_text() leaves out, and any other tag
+_HIDDEN_HTML_RE = re.compile(
+    r"<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL
+)
+_TAG_RE = re.compile(r"<[/!?]?[A-Za-z][^>]*>")
+# Anything but word characters, whitespace and basic punctuation
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s.,!?-]')
+
 
 class MessageFormatError(Exception):
     """Raised when message format is not suitable for conversion."""
     pass
 
 
+class Message(NamedTuple):
+    """A single chat message."""
+    role: str
+    content: str
+
+
 class MessageHandler:
     # Allowed types for messages
     ALLOWED_TYPES = (str, int, float, bool, dict, list)
 
     def __init__(self):
-        self.messages = []
+        self.messages: list[Message] = []
+        # Formatted prompt, rebuilt after the messages change
+        self._prompt: str | None = None
 
     def clear(self) -> None:
         """Clear all messages."""
         self.messages = []
+        self._prompt = None
 
     def _add_message(self, role: str, content: Any, to_flat_yaml: bool = True) -> None:
         """Add a message to the list."""
@@ -32,14 +85,12 @@ class MessageHandler:
             logger.error(f"Message already exists: {content}")
             return
 
-        self.messages.append({"role": role, "content": content})
+        self.messages.append(Message(role, content))
+        self._prompt = None
 
     def _validate_message(self, role: str, content: Any) -> bool:
         """Validate if message is already in the list."""
-        for message in self.messages:
-            if message["role"] == role and message["content"] == content:
-                return False
-        return True
+        return Message(role, content) not in self.messages
 
     def add_message_system(self, content: Any):
         """Add a system message."""
@@ -61,26 +112,32 @@ class MessageHandler:
 
     def format_raw_request(self) -> str:
         """Format the complete request for logging."""
-        formatted = []
-        for message in self.messages:
-            formatted.append(f"{message['role']}:\n{message['content']}\n")
-        return "\n\n".join(formatted)
+        return self.get_formatted_prompt()
 
     def get_formatted_prompt(self) -> str:
         """Get a formatted string representation of all messages."""
-        formatted = []
-
-        for message in self.messages:
-            formatted.append(f"{message['role']}:\n{message['content']}\n")
-
-        return "\n\n".join(formatted)
+        if self._prompt is None:
+            self._prompt = "\n\n".join(
+                f"{message.role}:\n{message.content}\n" for message in self.messages
+            )
+        return self._prompt
 
     def add_model_schema(self, answer_model: type[BaseModel]):
         """Generate schema instructions for the model."""
-        schema = answer_model.model_json_schema()
-        # Remove metadata that might confuse the AI
-        schema.pop('title', None)
-        schema.pop('type', None)
+        result = self._schema_instructions(answer_model)
+        self.messages.append(Message("system", result))
+        self._prompt = None
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _schema_instructions(answer_model: type[BaseModel]) -> str:
+        """Build the schema instructions once per model class."""
+        # Leave out metadata that might confuse the AI
+        schema = {
+            key: value
+            for key, value in answer_model.model_json_schema().items()
+            if key not in ('title', 'type')
+        }
 
         response = f"""
         Response:
@@ -90,12 +147,11 @@ class MessageHandler:
         - Do not return the schema itself, return only the JSON object based on
           the schema.
         [SCHEMA]
-        {json.dumps(schema)}
+        {_dump_json(schema)}
         [/SCHEMA]
 
         """
-        result = self.trim_message(response)
-        self.messages.append({"role": "system", "content": result})
+        return MessageHandler.trim_message(response)
 
     @staticmethod
     def trim_message(message: str) -> str:
@@ -109,26 +165,31 @@ class MessageHandler:
         """
         # Remove leading/trailing whitespace from each line
         # and collapse multiple spaces into single space
-        lines = message.split('\n')
-        trimmed_lines = [
-            re.sub(r'\s+', ' ', line.strip())
-            for line in lines
-        ]
+        lines = [' '.join(line.split()) for line in message.split('\n')]
         # Remove empty lines at start and end
-        while trimmed_lines and not trimmed_lines[0]:
-            trimmed_lines.pop(0)
-        while trimmed_lines and not trimmed_lines[-1]:
-            trimmed_lines.pop()
-        return '\n'.join(trimmed_lines)
+        start = next((i for i, line in enumerate(lines) if line), len(lines))
+        end = len(lines)
+        while end > start and not lines[end - 1]:
+            end -= 1
+        return '\n'.join(lines[start:end])
 
     @staticmethod
-    def normalize_text(text: str) -> str:
-        """Clean text from special characters and HTML tags"""
+    def normalize_text(text: str, strict: bool = False) -> str:
+        """Clean text from special characters and HTML tags
+
+        Tags are stripped with regexes; pass ``strict=True`` to parse the
+        markup with BeautifulSoup instead, e.g. for malformed HTML.
+        """
         # Remove HTML tags
-        soup = BeautifulSoup(text, "html.parser")
-        text = soup.get_text()
+        if strict:
+            from bs4 import BeautifulSoup
+
+            text = BeautifulSoup(text, _html_parser()).get_text()
+        else:
+            text = _TAG_RE.sub("", _HIDDEN_HTML_RE.sub("", text))
+            text = html.unescape(text)
         # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?-]', '', text)
+        text = _SPECIAL_CHARS_RE.sub('', text)
         # Normalize whitespace
         return ' '.join(text.split()).strip()
 
@@ -145,19 +206,26 @@ class MessageHandler:
                 f"Allowed types are: {allowed_types}"
             )
 
-        # First convert to YAML with proper indentation
-        yaml_str = yaml.dump(
-            data,
-            sort_keys=False,
-            default_flow_style=False,
-            allow_unicode=True,
-            indent=2,
-            width=200,
-            explicit_start=False,
-            explicit_end=False,
-            canonical=False,
-            default_style='',
-        )
+        if isinstance(data, str):
+            # Plain text needs no YAML quoting or document markers
+            yaml_str = data + '\n'
+        else:
+            import yaml
+
+            # First convert to YAML with proper indentation
+            yaml_str = yaml.dump(
+                data,
+                Dumper=_yaml_dumper(isinstance(data, (dict, list))),
+                sort_keys=False,
+                default_flow_style=False,
+                allow_unicode=True,
+                indent=2,
+                width=200,
+                explicit_start=False,
+                explicit_end=False,
+                canonical=False,
+                default_style='',
+            )
 
         # Add section markers if section is provided
         if section:
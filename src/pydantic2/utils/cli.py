@@ -5,6 +5,7 @@ import click
 import socket
 import signal
 import sys
+import tempfile
 import time
 import colorlog
 import logging
@@ -118,12 +119,20 @@ def kill_port(port: int) -> bool:
 
 def cleanup_processes():
     """Terminate all running processes."""
+    # Signal every process first so they shut down in parallel
     for process in running_processes:
         try:
             process.terminate()
-            process.wait(timeout=5)
+        except Exception as e:
+            logger.error(f"Error while terminating process: {e}")
+
+    deadline = time.monotonic() + 5
+    for process in running_processes:
+        try:
+            process.wait(timeout=max(0, deadline - time.monotonic()))
         except subprocess.TimeoutExpired:
             process.kill()
+            process.wait()
         except Exception as e:
             logger.error(f"Error while terminating process: {e}")
     running_processes.clear()
@@ -146,6 +155,36 @@ def format_url(port: int) -> str:
     return f"\033[1;94mhttp://localhost:{port}\033[0m"
 
 
+def wait_for_port(
+    process: subprocess.Popen,
+    port: int,
+    timeout: float = 10.0,
+    interval: float = 0.05
+) -> bool:
+    """
+    Wait until a server process accepts connections on a port.
+
+    Args:
+        process: Server process that should bind the port
+        port: Port to probe
+        timeout: Maximum time to wait in seconds
+        interval: Delay between probes in seconds
+
+    Returns:
+        bool: True once the port accepts, False if the process exits or time runs out
+    """
+    deadline = time.monotonic() + timeout
+    while process.poll() is None:
+        try:
+            with socket.create_connection(('localhost', port), timeout=interval):
+                return True
+        except OSError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+    return False
+
+
 def start_datasette(
     db_path: str,
     start_port: int,
@@ -154,9 +193,12 @@ def start_datasette(
     """Try to start datasette on an available port with retries."""
     for port in range(start_port, start_port + max_attempts):
         # Try to kill any existing process on this port
-        kill_port(port)
-        time.sleep(1)  # Give the system time to free the port
+        if kill_port(port):
+            time.sleep(1)  # Give the system time to free the port
 
+        # stderr goes to a file rather than a pipe: nothing reads the server's
+        # output once it is up, and a full pipe would stall it
+        error_log = tempfile.TemporaryFile()
         try:
             process = subprocess.Popen(
                 [
@@ -165,30 +207,28 @@ def start_datasette(
                     "--cors",
                     "--setting", "truncate_cells_html", "0"
                 ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                stdout=subprocess.DEVNULL,
+                stderr=error_log
             )
-            # Give the process a moment to start and bind to the port
-            time.sleep(1)
+            # Return as soon as the server accepts connections
+            if wait_for_port(process, port):
+                return process, port
 
-            # Check if process is still running
             if process.poll() is None:
-                # Try to connect to verify the server is up
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    try:
-                        s.connect(('localhost', port))
-                        return process, port
-                    except socket.error:
-                        process.terminate()
-                        continue
-            else:
-                # Process failed to start, clean up and try next port
-                _, stderr = process.communicate()
-                if b"address already in use" not in stderr:
-                    print(f"Failed to start datasette: {stderr.decode()}")
+                # Still running but never bound the port, try the next one
                 process.terminate()
+                continue
+
+            # Process failed to start, try next port
+            error_log.seek(0)
+            stderr = error_log.read()
+            if b"address already in use" not in stderr:
+                print(f"Failed to start datasette: {stderr.decode()}")
         except Exception as e:
             print(f"Error starting datasette on port {port}: {e}")
+        finally:
+            # The server keeps its own handle to the file
+            error_log.close()
 
     return None, None
 
@@ -205,8 +245,7 @@ def launch_viewer(db_path: str, db_name: str, start_port: int) -> bool:
     url = f"http://localhost:{port}"
     print(f"✓ {db_name} DB viewer: {format_url(port)}")
 
-    # Open browser after a short delay to ensure server is ready
-    time.sleep(1)
+    # start_datasette only returns once the server accepts connections
     try:
         webbrowser.open(url)
     except Exception as e:
@@ -0,0 +1,83 @@
+import pytest
+from pydantic import BaseModel
+from src.pydantic2.client.message_handler import Message, MessageHandler
+
+
+class ChatResponse(BaseModel):
+    """Simple chat response model"""
+    message: str
+    confidence: float
+
+
+@pytest.fixture
+def handler():
+    """Create a message handler with one system message"""
+    handler = MessageHandler()
+    handler.add_message_system("You are a helpful assistant")
+    return handler
+
+
+def test_prompt_cache_invalidated_by_new_message(handler):
+    """Test that adding a message rebuilds the cached prompt"""
+    prompt = handler.get_formatted_prompt()
+    assert handler.get_formatted_prompt() is prompt
+
+    handler.add_message_user("Hello")
+    updated = handler.get_formatted_prompt()
+    assert updated != prompt
+    assert updated.endswith("user:\nHello\n\n")
+
+
+def test_prompt_cache_invalidated_by_model_schema(handler):
+    """Test that adding a model schema rebuilds the cached prompt"""
+    prompt = handler.get_formatted_prompt()
+
+    handler.add_model_schema(ChatResponse)
+    updated = handler.get_formatted_prompt()
+    assert updated != prompt
+    assert "[SCHEMA]" in updated
+
+
+def test_prompt_cache_invalidated_by_clear(handler):
+    """Test that clearing messages also clears the cached prompt"""
+    assert handler.get_formatted_prompt()
+
+    handler.clear()
+    assert handler.messages == []
+    assert handler.get_formatted_prompt() == ""
+
+
+def test_duplicate_message_skipped(handler):
+    """Test that an identical message is only stored once"""
+    handler.add_message_user("Hello")
+    handler.add_message_user("Hello")
+    handler.add_message_block("data", "value")
+    handler.add_message_block("data", "value")
+
+    assert handler.messages == [
+        Message("system", "You are a helpful assistant\n"),
+        Message("user", "Hello\n"),
+        Message("user", "[DATA]:\nvalue\n[/DATA]"),
+    ]
+
+
+def test_same_content_with_other_role_kept(handler):
+    """Test that duplicates are matched on role and content together"""
+    handler.add_message_user("You are a helpful assistant")
+
+    assert [message.role for message in handler.messages] == ["system", "user"]
+
+
+def test_schema_instructions_reused_and_appended_each_time():
+    """Test that schema text is built once but added on every call"""
+    first = MessageHandler._schema_instructions(ChatResponse)
+    assert MessageHandler._schema_instructions(ChatResponse) is first
+
+    handler = MessageHandler()
+    handler.add_model_schema(ChatResponse)
+    handler.add_model_schema(ChatResponse)
+
+    assert handler.messages == [
+        Message("system", first),
+        Message("system", first),
+    ]